@@ -0,0 +1,60 @@
+import argparse
+import os
+import time
+import cv2 as cv
+import numpy as np
+from edge import detect_edges
+
+def make_frame(width, height, seed=0):
+    # Synthetic road-like frame: noisy background with a few bright lane lines
+    rng = np.random.default_rng(seed)
+    frame = (rng.random((height, width, 3)) * 255).astype(np.uint8)
+    frame = cv.GaussianBlur(frame, (0, 0), 3)
+    frame = cv.normalize(frame, None, 0, 255, cv.NORM_MINMAX)
+    for x in np.linspace(width * 0.2, width * 0.8, 4).astype(int):
+        cv.line(frame, (int(x), height), (width // 2, 0), (255, 255, 255), max(2, width // 200))
+    return frame
+
+def time_it(fn, repeat):
+    fn()  # warm up (thread pool, OpenCV buffers)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000.0
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark serial vs strip-parallel edge detection.")
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--max-threads", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    frame = make_frame(args.width, args.height)
+    detector = detect_edges(frame)
+    out = np.empty(frame.shape[:2], dtype=np.uint8)
+    reference = detector.canny_edge()
+
+    # Serial baseline as main.py runs it by default: OpenCV's own thread pool
+    default_threads = cv.getNumThreads()
+    serial_ms = time_it(detector.canny_edge, args.repeat)
+
+    # main.py --edge-threads N turns OpenCV's pool off so the two do not compete for cores
+    cv.setNumThreads(1)
+    serial_1_ms = time_it(detector.canny_edge, args.repeat)
+
+    print(f"Frame {args.width}x{args.height}, {os.cpu_count()} cores")
+    print(f"serial (OpenCV threads={default_threads}) : {serial_ms:8.2f} ms")
+    print(f"serial (OpenCV threads=1) : {serial_1_ms:8.2f} ms")
+
+    for threads in range(1, args.max_threads + 1):
+        result = detector.canny_edge_parallel(threads=threads, out=out)
+        if not np.array_equal(result, reference):
+            print(f"threads={threads}: output differs from serial path!")
+            return
+        ms = time_it(lambda: detector.canny_edge_parallel(threads=threads, out=out), args.repeat)
+        print(f"strips, threads={threads:<3}  : {ms:8.2f} ms  "
+              f"speedup x{serial_ms / ms:.2f} (vs default), x{serial_1_ms / ms:.2f} (vs 1 thread)")
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,13 @@
+import argparse
+import time
 import cv2 as cv 
 import numpy as np
 from inverse_perspective import inversePerspectiveTransform
 from searchBox import SearchBox
 from edge import detect_edges
 from steering import SteeringController
+from steering_loop import SteeringLoop
+from recorder import VideoRecorder
 
 def open_camera(cap):
     _, frame_size = cap.read()
@@ -58,7 +62,7 @@ def debug_perspective_transform(frame, src_points):
     return debug_frame
 
 
-def main():
+def main(record_path=None, record_every=1, record_failures=False, edge_threads=1):
     cap = cv.VideoCapture(0)
 
     if not cap.isOpened():
@@ -74,7 +78,13 @@ def main():
     ipt = inversePerspectiveTransform(frame_size)
     birdeye_view = ipt.inverse_perspective_transform(src_points, dst_points, w, h)
 
-    birdeye_edges = detect_edges(birdeye_view).canny_edge()
+    # One detector for the whole run so the parallel path can reuse its buffers
+    detector = detect_edges(birdeye_view)
+    birdeye_edges = detector.canny_edge()
+    if edge_threads > 1:
+        # Our strip pool replaces OpenCV's internal threads; running both oversubscribes the cores
+        cv.setNumThreads(1)
+        edge_out = np.empty(birdeye_edges.shape, dtype=np.uint8)
 
     search_box = SearchBox(birdeye_view, birdeye_edges, lx=100, rx=500, y=450, width=80, height=20)
 
@@ -82,12 +92,25 @@ def main():
     steering = SteeringController(frame_width=w, frame_height=h, lookahead_distance=0.6)
     
     # You can adjust PID gains for better performance
-    steering.set_gains(kp=0.5, ki=0.0, kd=0.1)
+    # ki/kd are per second now (kd=0.1 per frame at ~30 fps is ~0.003)
+    steering.set_gains(kp=0.5, ki=0.0, kd=0.003)
+
+    # Run the controller at a fixed rate, independent of the camera FPS
+    steering_loop = SteeringLoop(steering, rate_hz=100)
+    steering_loop.start()
+
+    # Optional background recording of the annotated output
+    recorder = None
+    if record_path is not None:
+        camera_fps = cap.get(cv.CAP_PROP_FPS) or 30.0
+        recorder = VideoRecorder(record_path, fps=camera_fps, every_nth=record_every,
+                                 failures_only=record_failures)
 
     while True:
         ret, frame = cap.read()
         if not ret:
             break
+        frame_time = time.monotonic()
 
         frame = cv.resize(frame, (720, 480))  # Resize to 720x480
 
@@ -96,8 +119,11 @@ def main():
         ipt = inversePerspectiveTransform(frame)
         birdeye_view = ipt.inverse_perspective_transform(src_points, dst_points, w, h)
 
-        detector = detect_edges(birdeye_view) # create edge detector instance
-        birdeye_edges = detector.canny_edge()
+        detector.frame = birdeye_view
+        if edge_threads > 1:
+            birdeye_edges = detector.canny_edge_parallel(threads=edge_threads, out=edge_out)
+        else:
+            birdeye_edges = detector.canny_edge()
         
         ## debug draw trapezoid
         debug_frame = debug_perspective_transform(frame, src_points)
@@ -111,7 +137,8 @@ def main():
         vis, llane, rlane = search_box.visualize()
 
         # --- STEERING CALCULATION ---
-        steering_angle, lane_center = steering.calculate_steering_angle(llane, rlane)
+        steering_loop.update_lane(steering.estimate_lane_center(llane, rlane), frame_time)
+        steering_angle, lane_center = steering_loop.latest()
 
         # --- VISUALIZATION ---
         # Draw steering information
@@ -153,7 +180,25 @@ def main():
         
         cv.putText(vis, direction, (10, 60), 
                    cv.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
+
+        # Control loop timing
+        jitter = steering_loop.jitter_stats()
+        if jitter["mean_period"] is not None:
+            cv.putText(vis, f'Ctrl: {jitter["mean_period"]:.1f} ms (jitter {jitter["max_jitter"]:.1f} ms)',
+                       (10, 115), cv.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
+
+        # Re-acquisition metric (frames spent without a lane before recovering)
+        reacquire = search_box.reacquire_stats()
+        if reacquire["last"] is not None:
+            cv.putText(vis, f'Reacquire: {reacquire["last"]} fr (avg {reacquire["mean"]:.1f})',
+                       (10, 90), cv.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
         
+        # Record the annotated frame without blocking the loop
+        if recorder is not None:
+            lane_lost = search_box.left_lost_frames > 0 or search_box.right_lost_frames > 0
+            recorder.record(vis, {"steering_angle": steering_angle, "lane_center": lane_center,
+                                  "lane_lost": lane_lost}, failure=lane_lost)
+
         # Show the result
         cv.imshow('Lane Detection with Steering', vis)
         # cv.imshow('Processed Mask', masked_edges)
@@ -172,8 +217,19 @@ def main():
             cv.destroyAllWindows()
             break
 
-    pass
+    steering_loop.stop()
+    if recorder is not None:
+        recorder.close()
+        print(f"Recording: {recorder.stats()}")
     
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Lane detection with steering.")
+    parser.add_argument("--record", default=None, help="Save annotated video to this file")
+    parser.add_argument("--record-every", type=int, default=1, help="Only record every Nth frame")
+    parser.add_argument("--record-failures", action="store_true",
+                        help="Only record frames around lane detection failures")
+    parser.add_argument("--edge-threads", type=int, default=1,
+                        help="Run edge detection on this many strips in parallel (1 = serial)")
+    args = parser.parse_args()
+    main(args.record, args.record_every, args.record_failures, args.edge_threads)
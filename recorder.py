@@ -0,0 +1,192 @@
+import json
+import os
+import queue
+import threading
+import time
+from collections import deque
+
+import cv2 as cv
+
+class VideoRecorder():
+    def __init__(self, path, fps=30.0, every_nth=1, failures_only=False, pre_frames=30, post_frames=30,
+                 queue_size=64, fourcc="mp4v", metadata_path=None):
+        """
+        Record annotated frames and their metadata on a background thread.
+
+        record() never blocks: frames go through a bounded queue and are dropped (and counted)
+        when the writer falls behind.
+
+        Parameters:
+        - path: Output video file
+        - fps: Frame rate of the submitted frames (the camera rate). The video is written at
+          fps / every_nth so it plays back in real time
+        - every_nth: Only record every Nth submitted frame (failure frames are always kept)
+        - failures_only: Only record frames around detection failures
+        - pre_frames, post_frames: Frames kept before / after a failure when failures_only is set
+        - queue_size: Max frames waiting to be encoded
+        - fourcc: Video codec
+        - metadata_path: JSON-lines file for per-frame metadata (default: <path>.jsonl)
+        """
+        self.path = path
+        self.every_nth = max(1, int(every_nth))
+        self.fps = fps / self.every_nth
+        self.failures_only = failures_only
+        self.post_frames = post_frames
+        self.fourcc = fourcc
+        self.metadata_path = metadata_path or os.path.splitext(path)[0] + ".jsonl"
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._pre_buffer = deque(maxlen=pre_frames)
+        self._post_remaining = 0
+        self._writer = None
+        self._thread = threading.Thread(target=self._run, name="VideoRecorder", daemon=True)
+        self._closed = False
+
+        # Statistics (dropped is updated from both threads)
+        self._stats_lock = threading.Lock()
+        self.submitted = 0
+        self.dropped = 0
+        self.written = 0
+        self.error = None
+        self._failed = False
+
+        self._thread.start()
+
+    def record(self, frame, metadata=None, failure=False):
+        """
+        Submit a frame for recording. Returns False if it was dropped because the queue is full
+        or the video writer could not be opened.
+
+        The recorder keeps a reference to `frame`; do not draw on it after submitting.
+
+        Parameters:
+        - frame: BGR (or grayscale) image
+        - metadata: Optional dict stored alongside the frame (must be JSON serializable)
+        - failure: True if detection failed on this frame
+        """
+        if self._closed:
+            return False
+
+        index = self.submitted
+        self.submitted += 1
+        item = (index, time.time(), frame, metadata)
+        keep_nth = index % self.every_nth == 0
+
+        if not self.failures_only:
+            # Failure frames bypass every_nth in both modes
+            return self._put(item) if keep_nth or failure else True
+
+        if failure:
+            # Failure frames bypass every_nth: flush the frames leading up to it,
+            # then keep recording for a while
+            ok = True
+            while self._pre_buffer:
+                ok = self._put(self._pre_buffer.popleft()) and ok
+            self._post_remaining = self.post_frames
+            return self._put(item) and ok
+
+        if self._post_remaining > 0:
+            self._post_remaining -= 1
+            return self._put(item) if keep_nth else True
+
+        if keep_nth:
+            self._pre_buffer.append(item)
+        return True
+
+    def _put(self, item):
+        if self._failed or not self._thread.is_alive():
+            self._count_dropped()
+            return False
+        try:
+            self._queue.put_nowait(item)
+            return True
+        except queue.Full:
+            self._count_dropped()
+            return False
+
+    def _count_dropped(self):
+        with self._stats_lock:
+            self.dropped += 1
+
+    def _run(self):
+        try:
+            meta_file = open(self.metadata_path, "w")
+        except OSError as e:
+            self.error = f"cannot open metadata file: {e}"
+            self._failed = True
+            self._drain()
+            return
+
+        with meta_file:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                if self._failed:
+                    # Writer could not be opened - discard but keep the queue moving
+                    self._count_dropped()
+                    continue
+                try:
+                    self._write(item, meta_file)
+                except Exception as e:
+                    # A bad frame or metadata value only costs that frame
+                    self.error = f"frame {item[0]}: {e!r}"
+                    self._count_dropped()
+
+        if self._writer is not None:
+            self._writer.release()
+            self._writer = None
+
+    def _write(self, item, meta_file):
+        index, timestamp, frame, metadata = item
+
+        record = {"frame": index, "time": timestamp}
+        if metadata:
+            record.update(metadata)
+        line = json.dumps(record, default=float)
+
+        if frame.ndim == 2:
+            frame = cv.cvtColor(frame, cv.COLOR_GRAY2BGR)
+
+        if self._writer is None:
+            h, w = frame.shape[:2]
+            self._writer = cv.VideoWriter(self.path, cv.VideoWriter_fourcc(*self.fourcc),
+                                          self.fps, (w, h))
+            if not self._writer.isOpened():
+                self._writer = None
+                self._failed = True
+                raise RuntimeError(f"cannot open video writer for {self.path} ({self.fourcc})")
+
+        self._writer.write(frame)
+        meta_file.write(line + "\n")
+        self.written += 1
+
+    def _drain(self):
+        # Consume queued items until close() so record() never fills a dead queue
+        while self._queue.get() is not None:
+            self._count_dropped()
+
+    def stats(self):
+        """Recording statistics."""
+        return {
+            "submitted": self.submitted,
+            "written": self.written,
+            "dropped": self.dropped,
+            "queued": self._queue.qsize(),
+            "error": self.error,
+        }
+
+    def close(self):
+        """Finish writing queued frames and release the video file."""
+        if self._closed:
+            return
+        self._closed = True
+        while self._thread.is_alive():
+            try:
+                self._queue.put(None, timeout=0.1)
+                break
+            except queue.Full:
+                continue
+        self._thread.join()
+        if self.error is not None:
+            print(f"VideoRecorder: {self.error}")
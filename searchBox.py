@@ -2,16 +2,20 @@ import cv2 as cv
 import numpy as np
 
 class SearchBox():
-    def __init__(self, frame, mask, lx=80, rx=150, y=245, width=100, height=20, num_boxes=10):
+    def __init__(self, frame, mask, lx=80, rx=150, y=245, width=100, height=20, num_boxes=10,
+                 auto_acquire=True, hist_fraction=0.5, min_peak=5):
         """
         Initialize the detector with a mask and ROI parameters.
         
         Parameters:
         - mask: Binary mask (numpy array)
-        - lx, rx: Initial x positions for left and right lanes
+        - lx, rx: Initial x positions for left and right lanes (fallback if acquisition fails)
         - y: Bottom starting y coordinate
         - width, height: Dimensions of rectangle
         - num_boxes: Number of boxes to stack
+        - auto_acquire: Seed box positions from the mask histogram at startup and on reset
+        - hist_fraction: Lower fraction of the mask used for the column histogram
+        - min_peak: Minimum number of edge pixels in a column to accept it as a lane peak
         """
         self.mask = mask
         self.frame = frame
@@ -33,6 +37,94 @@ class SearchBox():
         
         self.roi_mask = None
         self.avg_x = None
+
+        # Histogram acquisition settings
+        self.auto_acquire = auto_acquire
+        self.hist_fraction = hist_fraction
+        self.min_peak = min_peak
+
+        # Re-acquisition metrics
+        self.left_lost_frames = 0
+        self.right_lost_frames = 0
+        # Running totals so stats stay O(1) on long runs
+        self.reacquire_count = 0
+        self.reacquire_total = 0
+        self.reacquire_max = 0
+        self.reacquire_last = None
+
+        if self.auto_acquire:
+            left_peak, right_peak = self.acquire()
+            if left_peak is not None:
+                self.left_positions = [left_peak] * num_boxes
+            if right_peak is not None:
+                self.right_positions = [right_peak] * num_boxes
+
+    def acquire(self):
+        """
+        Find lane base positions from a column histogram of the lower part of the mask.
+        Returns (left_x, right_x) as box left edges, or None for a side without a peak.
+        """
+        gray = self.mask if self.mask.ndim == 2 else cv.cvtColor(self.mask, cv.COLOR_BGR2GRAY)
+        h = gray.shape[0]
+        start = int(h * (1 - self.hist_fraction))
+
+        # Count edge pixels per column
+        histogram = np.count_nonzero(gray[start:], axis=0)
+
+        # Smooth with a box a quarter of a search window wide so one wide lane gives one peak
+        kernel = np.ones(max(1, self.width // 4), dtype=np.float32)
+        smoothed = np.convolve(histogram, kernel, mode='same')
+
+        left_x = None
+        right_x = None
+        if self.center_x > 0 and histogram[:self.center_x].max(initial=0) >= self.min_peak:
+            left_x = int(round(self._peak_center(histogram, smoothed, 0, self.center_x))) - self.width // 2
+        if self.center_x < histogram.size and histogram[self.center_x:].max(initial=0) >= self.min_peak:
+            right_x = int(round(self._peak_center(histogram, smoothed, self.center_x, histogram.size))) - self.width // 2
+
+        return left_x, right_x
+
+    def _peak_center(self, histogram, smoothed, lo, hi):
+        """
+        Locate the peak in [lo, hi) with the smoothed histogram, then refine it to the
+        centroid of the raw histogram within a search window around it.
+        """
+        peak = lo + int(np.argmax(smoothed[lo:hi]))
+        start = max(lo, peak - self.width // 2)
+        end = min(hi, peak + self.width // 2 + 1)
+        counts = histogram[start:end]
+        if counts.sum() == 0:
+            return peak
+        return float(np.average(np.arange(start, end), weights=counts))
+
+    def _track_reacquire(self, lost, side):
+        """
+        Update the lost-frame counter for one side and record frames-to-reacquire on recovery.
+        """
+        attr = f"{side}_lost_frames"
+        count = getattr(self, attr)
+        if lost:
+            setattr(self, attr, count + 1)
+        else:
+            if count > 0:
+                self.reacquire_count += 1
+                self.reacquire_total += count
+                self.reacquire_max = max(self.reacquire_max, count)
+                self.reacquire_last = count
+            setattr(self, attr, 0)
+
+    def reacquire_stats(self):
+        """
+        Summary of frames needed to recover a lane after all boxes lost it.
+        """
+        if self.reacquire_count == 0:
+            return {"count": 0, "mean": None, "max": None, "last": None}
+        return {
+            "count": self.reacquire_count,
+            "mean": self.reacquire_total / self.reacquire_count,
+            "max": self.reacquire_max,
+            "last": self.reacquire_last,
+        }
     
     def set_roi(self, x, y, width, height):
         """
@@ -105,13 +197,25 @@ class SearchBox():
             right_detections.append(right_new_x)
 
         # Check if all boxes have no detection - if so, reset positions
-        if all(d is None for d in left_detections):
-            self.left_positions = [self.initial_lx] * self.num_boxes
-            left_detections = [self.initial_lx] * self.num_boxes
+        left_lost = all(d is None for d in left_detections)
+        right_lost = all(d is None for d in right_detections)
+        self._track_reacquire(left_lost, "left")
+        self._track_reacquire(right_lost, "right")
+
+        # Re-seed lost lanes from the histogram, falling back to the initial positions
+        left_peak, right_peak = None, None
+        if (left_lost or right_lost) and self.auto_acquire:
+            left_peak, right_peak = self.acquire()
+
+        if left_lost:
+            reset_lx = left_peak if left_peak is not None else self.initial_lx
+            self.left_positions = [reset_lx] * self.num_boxes
+            left_detections = [reset_lx] * self.num_boxes
             
-        if all(d is None for d in right_detections):
-            self.right_positions = [self.initial_rx] * self.num_boxes
-            right_detections = [self.initial_rx] * self.num_boxes
+        if right_lost:
+            reset_rx = right_peak if right_peak is not None else self.initial_rx
+            self.right_positions = [reset_rx] * self.num_boxes
+            right_detections = [reset_rx] * self.num_boxes
 
         # Process left lane boxes
         for i in range(self.num_boxes):
@@ -1,7 +1,7 @@
 import numpy as np
 
 class SteeringController():
-    def __init__(self, frame_width=320, frame_height=240, lookahead_distance=0.7):
+    def __init__(self, frame_width=320, frame_height=240, lookahead_distance=0.7, integral_limit=None):
         """
         Initialize the steering controller.
         
@@ -9,6 +9,8 @@ class SteeringController():
         - frame_width: Width of the frame in pixels
         - frame_height: Height of the frame in pixels
         - lookahead_distance: How far ahead to look (0.0 to 1.0, where 1.0 is top of frame)
+        - integral_limit: Clamp for the integral term (anti-windup). None = derive from ki so
+          the integral alone can at most saturate the output
         """
         self.frame_width = frame_width
         self.frame_height = frame_height
@@ -20,28 +22,48 @@ class SteeringController():
         self.ki = 0.0  # Integral gain (optional, set to 0 for now)
         self.kd = 0.1  # Derivative gain
         
-        # State variables
-        self.prev_error = 0
+        self.integral_limit = integral_limit
+        
+        # State variables (prev_error None = no previous sample, skip the D term)
+        self.prev_error = None
         self.integral = 0
         
-    def calculate_steering_angle(self, llane, rlane):
+    def calculate_steering_angle(self, llane, rlane, dt=None):
         """
         Calculate steering angle based on detected lane positions.
         
         Parameters:
         - llane: Tuple of (x_coords, y_coords) for left lane
         - rlane: Tuple of (x_coords, y_coords) for right lane
+        - dt: Seconds since the previous update. None = one step per frame
         
         Returns:
         - steering_angle: Angle in degrees (-90 to +90, negative = left, positive = right)
         - lane_center: Calculated center of the lane
         """
+        lane_center = self.estimate_lane_center(llane, rlane)
+        if lane_center is None:
+            return 0.0, self.center_x
+        
+        return self.update(lane_center, dt), lane_center
+
+    def estimate_lane_center(self, llane, rlane):
+        """
+        Estimate the lane center at the lookahead point.
+        
+        Parameters:
+        - llane: Tuple of (x_coords, y_coords) for left lane
+        - rlane: Tuple of (x_coords, y_coords) for right lane
+        
+        Returns:
+        - lane_center in pixels, or None if no lane detected
+        """
         lx, ly = llane
         rx, ry = rlane
         
-        # If no lane detected, return 0 (straight)
+        # If no lane detected, there is no center
         if len(lx) == 0 and len(rx) == 0:
-            return 0.0, self.center_x
+            return None
         
         # Calculate lookahead y position
         lookahead_y = int(self.frame_height * (1 - self.lookahead_distance))
@@ -68,14 +90,45 @@ class SteeringController():
             elif len(rx) > 0:
                 lane_center = rx[-1] - 50
             else:
-                return 0.0, self.center_x
+                return None
+        
+        return lane_center
+
+    def update(self, lane_center, dt=None):
+        """
+        Run one PID step on a lane center estimate.
+        
+        Parameters:
+        - lane_center: Lane center in pixels
+        - dt: Seconds since the previous update. None = one step per frame
+        
+        Returns:
+        - steering_angle in degrees
+        """
+        if dt is None:
+            dt = 1.0
+        if dt <= 0:
+            dt = 1e-6
         
         # Calculate error (deviation from center)
         error = lane_center - self.center_x
         
+        # Max deviation is roughly half frame width
+        max_deviation = self.frame_width / 2
+        
         # PID control
-        self.integral += error
-        derivative = error - self.prev_error
+        self.integral += error * dt
+        limit = self.integral_limit
+        if limit is None and self.ki != 0:
+            limit = max_deviation / abs(self.ki)
+        if limit is not None:
+            # Anti-windup: keep the integral from growing past what the output can use
+            self.integral = float(np.clip(self.integral, -limit, limit))
+        if self.prev_error is None:
+            # First sample after start/reset - no history to differentiate against
+            derivative = 0.0
+        else:
+            derivative = (error - self.prev_error) / dt
         
         # Calculate control output
         output = (self.kp * error + 
@@ -85,14 +138,12 @@ class SteeringController():
         self.prev_error = error
         
         # Convert to steering angle (normalize and scale)
-        # Max deviation is roughly half frame width
-        max_deviation = self.frame_width / 2
         normalized_output = np.clip(output / max_deviation, -1.0, 1.0)
         
         # Scale to degrees (-45 to +45 is reasonable for most applications)
         steering_angle = normalized_output * 45.0
         
-        return steering_angle, lane_center
+        return steering_angle
     
     def _get_x_at_y(self, x_coords, y_coords, target_y):
         """
@@ -126,7 +177,7 @@ class SteeringController():
     
     def reset(self):
         """Reset the controller state."""
-        self.prev_error = 0
+        self.prev_error = None
         self.integral = 0
     
     def set_gains(self, kp=None, ki=None, kd=None):
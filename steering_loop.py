@@ -0,0 +1,210 @@
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+class SteeringLoop():
+    def __init__(self, controller, rate_hz=100.0, max_extrapolation=0.1, stale_after=0.15,
+                 velocity_smoothing=0.3, on_output=None, history=1000):
+        """
+        Run a SteeringController at a fixed rate on its own thread, decoupled from the camera.
+
+        Parameters:
+        - controller: SteeringController instance (used for its PID via update())
+        - rate_hz: Control loop rate in Hz
+        - max_extrapolation: Longest time (s) to extrapolate the lane center past the last vision update
+        - stale_after: Treat the lane as lost when the last vision update is older than this (s)
+        - velocity_smoothing: Weight (0..1] of the newest sample in the lane-center velocity average
+        - on_output: Optional callback(steering_angle, lane_center, timestamp) called every tick
+        - history: Number of loop periods kept for jitter statistics
+        """
+        self.controller = controller
+        self.rate_hz = rate_hz
+        self.period = 1.0 / rate_hz
+        self.max_extrapolation = max_extrapolation
+        self.stale_after = stale_after
+        self.velocity_smoothing = velocity_smoothing
+        self.on_output = on_output
+
+        self._lock = threading.Lock()
+        self._thread = None
+        self._running = False
+
+        # Last two vision estimates as (timestamp, lane_center), and smoothed velocity (px/s)
+        self._estimates = deque(maxlen=2)
+        self._velocity = 0.0
+        self._tracking = False
+
+        # Latest controller output
+        self.steering_angle = 0.0
+        self.lane_center = controller.center_x
+        self.output_time = None
+
+        # Timing statistics
+        self._periods = deque(maxlen=history)
+        self.overruns = 0
+        self.ticks = 0
+        self.stale_events = 0
+
+    def start(self):
+        """Start the control thread."""
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="SteeringLoop", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the control thread and wait for it to exit."""
+        self._running = False
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def update_lane(self, lane_center, timestamp=None):
+        """
+        Feed a new lane estimate from the vision pipeline.
+
+        Parameters:
+        - lane_center: Lane center in pixels, or None if no lane detected
+        - timestamp: time.monotonic() of the frame capture. None = now
+        """
+        if timestamp is None:
+            timestamp = time.monotonic()
+        with self._lock:
+            if lane_center is None:
+                # Lost the lane - drop history so we do not extrapolate a stale trend,
+                # and make the next tick restart the PID even if the loss was shorter than a tick
+                self._estimates.clear()
+                self._velocity = 0.0
+                self._tracking = False
+            else:
+                if self._estimates:
+                    t0, c0 = self._estimates[-1]
+                    if timestamp > t0:
+                        # Exponential average so frame-to-frame noise does not drive extrapolation
+                        raw = (lane_center - c0) / (timestamp - t0)
+                        self._velocity += self.velocity_smoothing * (raw - self._velocity)
+                self._estimates.append((timestamp, float(lane_center)))
+
+    def latest(self):
+        """
+        Returns the most recent (steering_angle, lane_center) produced by the loop.
+        """
+        with self._lock:
+            return self.steering_angle, self.lane_center
+
+    def predict_lane_center(self, now):
+        """
+        Extrapolate the lane center to time `now` from the last vision estimate and the
+        smoothed lane-center velocity.
+        Returns None if no estimate is available or the last one is older than stale_after.
+        """
+        with self._lock:
+            if not self._estimates:
+                return None
+            t1, c1 = self._estimates[-1]
+            velocity = self._velocity
+
+        age = now - t1
+        if age > self.stale_after:
+            return None
+
+        # Constant-velocity extrapolation, capped so a slow frame does not run away
+        return c1 + velocity * min(max(0.0, age), self.max_extrapolation)
+
+    def step(self, now, dt):
+        """
+        Run one control tick.
+
+        Parameters:
+        - now: Current time.monotonic()
+        - dt: Seconds since the previous tick
+
+        Returns:
+        - (steering_angle, lane_center)
+        """
+        lane_center = self.predict_lane_center(now)
+        if lane_center is None:
+            with self._lock:
+                lost = self._tracking
+                self._tracking = False
+                if self._estimates and now - self._estimates[-1][0] > self.stale_after:
+                    # Vision stopped updating - drop the stale estimate and count it
+                    self._estimates.clear()
+                    self._velocity = 0.0
+                    if lost:
+                        self.stale_events += 1
+            if lost:
+                self.controller.reset()
+            steering_angle = 0.0
+            lane_center = self.controller.center_x
+        else:
+            with self._lock:
+                reacquired = not self._tracking
+                self._tracking = True
+            if reacquired:
+                # (Re)acquired the lane - drop PID state from before the loss
+                self.controller.reset()
+            steering_angle = self.controller.update(lane_center, dt)
+
+        with self._lock:
+            self.steering_angle = steering_angle
+            self.lane_center = lane_center
+            self.output_time = now
+
+        if self.on_output is not None:
+            self.on_output(steering_angle, lane_center, now)
+
+        return steering_angle, lane_center
+
+    def _run(self):
+        last = time.monotonic()
+        next_tick = last + self.period
+        while self._running:
+            delay = next_tick - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+            now = time.monotonic()
+            dt = now - last
+            last = now
+
+            self.step(now, dt)
+
+            with self._lock:
+                self._periods.append(dt)
+                self.ticks += 1
+
+            next_tick += self.period
+            if now - next_tick > self.period:
+                # Fell more than a period behind - resync instead of bursting to catch up
+                with self._lock:
+                    self.overruns += 1
+                next_tick = now + self.period
+
+    def jitter_stats(self):
+        """
+        Timing statistics of the control loop (periods in milliseconds).
+        stale_events counts times the lane was dropped because vision stopped updating.
+        """
+        with self._lock:
+            periods = np.array(self._periods)
+            overruns = self.overruns
+            ticks = self.ticks
+            stale_events = self.stale_events
+
+        if periods.size == 0:
+            return {"ticks": ticks, "overruns": overruns, "stale_events": stale_events,
+                    "mean_period": None, "std": None, "max_jitter": None}
+
+        periods_ms = periods * 1000.0
+        return {
+            "ticks": ticks,
+            "overruns": overruns,
+            "stale_events": stale_events,
+            "mean_period": float(periods_ms.mean()),
+            "std": float(periods_ms.std()),
+            "max_jitter": float(np.abs(periods_ms - self.period * 1000.0).max()),
+        }